@@ -25,9 +25,6 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# Inject custom CSS
-st.markdown(get_custom_css(), unsafe_allow_html=True)
-
 # =============================================================================
 # Session state initialization
 # =============================================================================
@@ -39,6 +36,17 @@ if "current_page" not in st.session_state:
 
 lang = st.session_state.lang
 
+# Inject custom CSS — só os fragmentos usados pela página atual
+PAGE_CSS = {
+    "hub": ("hub",),
+    "spi": ("kpi", "comparison"),
+    "sgs": ("kpi",),
+}
+st.markdown(
+    get_custom_css(PAGE_CSS.get(st.session_state.current_page, ())),
+    unsafe_allow_html=True,
+)
+
 
 # =============================================================================
 # Navigation helper
@@ -7,15 +7,16 @@ via API do Banco Central (endpoint PixLiquidadosAtual).
 
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime, date, timedelta
-from utils.i18n import t
+from utils.i18n import get_translator
 from utils.helpers import (
+    BR_TABLE,
     fmt_number,
     fmt_brl,
     fmt_pct,
     render_kpi_card,
     render_comparison_item,
+    df_fingerprint,
     to_excel_bytes,
     to_csv_bytes,
 )
@@ -53,9 +54,13 @@ def fetch_spi_data(start_date: date) -> pd.DataFrame:
         .collect()
     )
 
-    # Garante tipos corretos
+    # Garante tipos corretos (downcast só na contagem inteira; Total e Media
+    # permanecem float64 — vão direto para o XLSX, onde float32 vira ruído decimal)
     df["Data"] = pd.to_datetime(df["Data"]).dt.date
-    df["Quantidade"] = pd.to_numeric(df["Quantidade"], errors="coerce").astype("Int64")
+    df["Quantidade"] = pd.to_numeric(
+        pd.to_numeric(df["Quantidade"], errors="coerce").astype("Int64"),
+        downcast="integer",
+    )
     df["Total"] = pd.to_numeric(df["Total"], errors="coerce")
     df["Media"] = pd.to_numeric(df["Media"], errors="coerce")
 
@@ -88,6 +93,7 @@ PLOTLY_LAYOUT = dict(
 )
 
 
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False, hash_funcs={pd.DataFrame: df_fingerprint})
 def make_area_chart(
     df: pd.DataFrame,
     x_col: str,
@@ -95,7 +101,7 @@ def make_area_chart(
     color: str,
     title: str,
     y_label: str,
-) -> go.Figure:
+) -> dict:
     """Cria gráfico de área com gradiente."""
     # Cor com transparência para o fill
     color_map = {
@@ -106,27 +112,43 @@ def make_area_chart(
     }
     line_color, fill_color = color_map.get(color, color_map["cyan"])
 
-    fig = go.Figure()
-
-    fig.add_trace(
-        go.Scatter(
-            x=df[x_col],
-            y=df[y_col],
-            mode="lines",
-            line=dict(color=line_color, width=2),
-            fill="tozeroy",
-            fillcolor=fill_color,
-            hovertemplate=f"%{{x|%d/%m/%Y}}<br>{y_label}: %{{y:,.0f}}<extra></extra>",
-        )
-    )
+    # Figura como dict puro: serializa direto para Plotly.js e é barata de
+    # guardar no cache (sem objetos go.Figure)
+    return {
+        "data": [
+            {
+                "type": "scatter",
+                "x": df[x_col].tolist(),
+                "y": df[y_col].astype("float64").tolist(),
+                "mode": "lines",
+                "line": {"color": line_color, "width": 2},
+                "fill": "tozeroy",
+                "fillcolor": fill_color,
+                "hovertemplate": f"%{{x|%d/%m/%Y}}<br>{y_label}: %{{y:,.0f}}<extra></extra>",
+            }
+        ],
+        "layout": {
+            **PLOTLY_LAYOUT,
+            "title": {"text": title, "font": {"size": 14}},
+            "height": 320,
+        },
+    }
+
+
+# =============================================================================
+# Export helpers (com cache)
+# =============================================================================
+
+@st.cache_data(ttl=3600, max_entries=8, show_spinner=False, hash_funcs={pd.DataFrame: df_fingerprint})
+def _csv_cached(df: pd.DataFrame) -> bytes:
+    """CSV do período filtrado, serializado uma única vez por recorte de dados."""
+    return to_csv_bytes(df)
 
-    fig.update_layout(
-        **PLOTLY_LAYOUT,
-        title=dict(text=title, font=dict(size=14)),
-        height=320,
-    )
 
-    return fig
+@st.cache_data(ttl=3600, max_entries=8, show_spinner=False, hash_funcs={pd.DataFrame: df_fingerprint})
+def _xlsx_cached(df: pd.DataFrame) -> bytes:
+    """XLSX do período filtrado, serializado uma única vez por recorte de dados."""
+    return to_excel_bytes(df, num_format_cols=("Total", "Media"))
 
 
 # =============================================================================
@@ -135,14 +157,15 @@ def make_area_chart(
 
 def compute_stats(df: pd.DataFrame, lang: str) -> pd.DataFrame:
     """Calcula estatísticas descritivas para as colunas numéricas."""
+    tr = get_translator(lang)
     stats_labels = {
-        "mean": t("stat_mean", lang),
-        "50%": t("stat_median", lang),
-        "std": t("stat_std", lang),
-        "min": t("stat_min", lang),
-        "max": t("stat_max", lang),
-        "25%": t("stat_q1", lang),
-        "75%": t("stat_q3", lang),
+        "mean": tr["stat_mean"],
+        "50%": tr["stat_median"],
+        "std": tr["stat_std"],
+        "min": tr["stat_min"],
+        "max": tr["stat_max"],
+        "25%": tr["stat_q1"],
+        "75%": tr["stat_q3"],
     }
 
     desc = df[["Quantidade", "Total", "Media"]].describe()
@@ -151,10 +174,10 @@ def compute_stats(df: pd.DataFrame, lang: str) -> pd.DataFrame:
     for stat_key, label in stats_labels.items():
         rows.append(
             {
-                t("stat_metric", lang): label,
-                t("stat_qty", lang): fmt_number(desc.loc[stat_key, "Quantidade"]),
-                t("stat_total", lang): fmt_brl(desc.loc[stat_key, "Total"]),
-                t("stat_avg", lang): f"R$ {desc.loc[stat_key, 'Media']:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."),
+                tr["stat_metric"]: label,
+                tr["stat_qty"]: fmt_number(desc.loc[stat_key, "Quantidade"]),
+                tr["stat_total"]: fmt_brl(desc.loc[stat_key, "Total"]),
+                tr["stat_avg"]: f"R$ {desc.loc[stat_key, 'Media']:,.2f}".translate(BR_TABLE),
             }
         )
 
@@ -167,9 +190,10 @@ def compute_stats(df: pd.DataFrame, lang: str) -> pd.DataFrame:
 
 def render(lang: str):
     """Renderiza toda a página do módulo SPI."""
+    tr = get_translator(lang)
 
     # ----- Back button -----
-    if st.button(t("back_to_hub", lang), key="back_to_hub"):
+    if st.button(tr["back_to_hub"], key="back_to_hub"):
         st.session_state.current_page = "hub"
         st.rerun()
 
@@ -178,10 +202,10 @@ def render(lang: str):
         f"""
         <div style="margin-bottom: 24px;">
             <h1 style="font-size:28px; font-weight:700; letter-spacing:-0.02em;">
-                {t("spi_page_title", lang)}
+                {tr["spi_page_title"]}
             </h1>
             <p style="color:#94A3B8; font-size:14px; margin-top:4px;">
-                {t("spi_page_desc", lang)}
+                {tr["spi_page_desc"]}
             </p>
         </div>
         """,
@@ -193,7 +217,7 @@ def render(lang: str):
 
     with col_start:
         start_date = st.date_input(
-            t("start_date", lang),
+            tr["start_date"],
             value=date(2023, 1, 1),
             min_value=date(2020, 11, 3),  # Pix started Nov 2020
             max_value=date.today(),
@@ -202,7 +226,7 @@ def render(lang: str):
 
     with col_end:
         end_date = st.date_input(
-            t("end_date", lang),
+            tr["end_date"],
             value=date.today(),
             min_value=start_date,
             max_value=date.today(),
@@ -212,7 +236,7 @@ def render(lang: str):
     with col_btn:
         st.markdown("<br>", unsafe_allow_html=True)  # align button
         query_btn = st.button(
-            t("query_api", lang),
+            tr["query_api"],
             key="query_spi",
             use_container_width=True,
             type="primary",
@@ -228,48 +252,47 @@ def render(lang: str):
 
     if not st.session_state.get("spi_queried", False):
         st.info(
-            f"👆 {t('start_date', lang)}: selecione a data e clique em "
-            f"**{t('query_api', lang)}** para carregar os dados."
+            f"👆 {tr['start_date']}: selecione a data e clique em "
+            f"**{tr['query_api']}** para carregar os dados."
             if lang == "pt"
-            else f"👆 Select the {t('start_date', lang).lower()} and click "
-            f"**{t('query_api', lang)}** to load data."
+            else f"👆 Select the {tr['start_date'].lower()} and click "
+            f"**{tr['query_api']}** to load data."
         )
         return
 
     # Fetch with spinner
     try:
-        with st.spinner(t("loading", lang)):
+        with st.spinner(tr["loading"]):
             df = fetch_spi_data(start_date)
     except Exception as e:
-        st.error(t("api_error", lang))
-        st.caption(t("api_error_detail", lang))
+        st.error(tr["api_error"])
+        st.caption(tr["api_error_detail"])
         with st.expander("Detalhes do erro"):
             st.code(str(e))
         return
 
     # Filter end date
-    df = df[df["Data"] <= end_date].copy()
+    df = df[df["Data"] <= end_date]
 
     if df.empty:
-        st.warning(t("no_data", lang))
+        st.warning(tr["no_data"])
         return
 
     # =====================================================================
     # KPI CARDS
     # =====================================================================
     total_days = len(df)
-    total_qty = df["Quantidade"].sum()
-    total_vol = df["Total"].sum()
-    avg_daily = df["Media"].mean()
+    kpi = df.agg({"Quantidade": "sum", "Total": "sum", "Media": "mean"})
+    total_qty, total_vol, avg_daily = kpi["Quantidade"], kpi["Total"], kpi["Media"]
 
     k1, k2, k3, k4 = st.columns(4, gap="small")
 
     with k1:
         st.markdown(
             render_kpi_card(
-                t("kpi_days", lang),
+                tr["kpi_days"],
                 f"{total_days:,}".replace(",", "."),
-                t("kpi_days_sub", lang),
+                tr["kpi_days_sub"],
                 "cyan",
             ),
             unsafe_allow_html=True,
@@ -278,9 +301,9 @@ def render(lang: str):
     with k2:
         st.markdown(
             render_kpi_card(
-                t("kpi_qty", lang),
+                tr["kpi_qty"],
                 fmt_number(total_qty),
-                t("kpi_qty_sub", lang),
+                tr["kpi_qty_sub"],
                 "emerald",
             ),
             unsafe_allow_html=True,
@@ -289,9 +312,9 @@ def render(lang: str):
     with k3:
         st.markdown(
             render_kpi_card(
-                t("kpi_volume", lang),
+                tr["kpi_volume"],
                 fmt_brl(total_vol),
-                t("kpi_volume_sub", lang),
+                tr["kpi_volume_sub"],
                 "amber",
             ),
             unsafe_allow_html=True,
@@ -300,9 +323,9 @@ def render(lang: str):
     with k4:
         st.markdown(
             render_kpi_card(
-                t("kpi_avg", lang),
+                tr["kpi_avg"],
                 fmt_brl(avg_daily),
-                t("kpi_avg_sub", lang),
+                tr["kpi_avg_sub"],
                 "rose",
             ),
             unsafe_allow_html=True,
@@ -321,8 +344,8 @@ def render(lang: str):
             x_col="Data",
             y_col="Quantidade",
             color="cyan",
-            title=t("chart_qty_title", lang),
-            y_label=t("chart_quantity", lang),
+            title=tr["chart_qty_title"],
+            y_label=tr["chart_quantity"],
         )
         st.plotly_chart(fig_qty, use_container_width=True, config={"displayModeBar": False})
 
@@ -332,8 +355,8 @@ def render(lang: str):
             x_col="Data",
             y_col="Total",
             color="emerald",
-            title=t("chart_vol_title", lang),
-            y_label=t("chart_total", lang),
+            title=tr["chart_vol_title"],
+            y_label=tr["chart_total"],
         )
         st.plotly_chart(fig_vol, use_container_width=True, config={"displayModeBar": False})
 
@@ -341,18 +364,18 @@ def render(lang: str):
     # PERIOD COMPARISON
     # =====================================================================
     st.markdown(
-        f'<div class="section-title">{t("comparison_title", lang)}</div>',
+        f'<div class="section-title">{tr["comparison_title"]}</div>',
         unsafe_allow_html=True,
     )
 
     comp_col1, comp_col2 = st.columns(2, gap="medium")
 
     with comp_col1:
-        st.caption(f"🔵 {t('period_a', lang)}")
+        st.caption(f"🔵 {tr['period_a']}")
         ca1, ca2 = st.columns(2)
         with ca1:
             comp_a_start = st.date_input(
-                f"{t('start_date', lang)} A",
+                f"{tr['start_date']} A",
                 value=start_date,
                 min_value=start_date,
                 max_value=end_date,
@@ -364,7 +387,7 @@ def render(lang: str):
             # Default: midpoint between start and end
             midpoint = start_date + (end_date - start_date) // 2
             comp_a_end = st.date_input(
-                f"{t('end_date', lang)} A",
+                f"{tr['end_date']} A",
                 value=midpoint,
                 min_value=comp_a_start,
                 max_value=end_date,
@@ -374,11 +397,11 @@ def render(lang: str):
             )
 
     with comp_col2:
-        st.caption(f"🟣 {t('period_b', lang)}")
+        st.caption(f"🟣 {tr['period_b']}")
         cb1, cb2 = st.columns(2)
         with cb1:
             comp_b_start = st.date_input(
-                f"{t('start_date', lang)} B",
+                f"{tr['start_date']} B",
                 value=comp_a_end + timedelta(days=1),
                 min_value=start_date,
                 max_value=end_date,
@@ -388,7 +411,7 @@ def render(lang: str):
             )
         with cb2:
             comp_b_end = st.date_input(
-                f"{t('end_date', lang)} B",
+                f"{tr['end_date']} B",
                 value=end_date,
                 min_value=comp_b_start,
                 max_value=end_date,
@@ -398,16 +421,15 @@ def render(lang: str):
             )
 
     # Compute comparison
-    df_a = df[(df["Data"] >= comp_a_start) & (df["Data"] <= comp_a_end)]
-    df_b = df[(df["Data"] >= comp_b_start) & (df["Data"] <= comp_b_end)]
+    # Uma redução por período (os períodos podem se sobrepor, então
+    # não dá para rotular cada linha com um único período)
+    mask_a = df["Data"].between(comp_a_start, comp_a_end)
+    mask_b = df["Data"].between(comp_b_start, comp_b_end)
 
-    if not df_a.empty and not df_b.empty:
-        avg_qty_a = df_a["Quantidade"].mean()
-        avg_qty_b = df_b["Quantidade"].mean()
-        avg_vol_a = df_a["Total"].mean()
-        avg_vol_b = df_b["Total"].mean()
-        avg_ticket_a = df_a["Media"].mean()
-        avg_ticket_b = df_b["Media"].mean()
+    if mask_a.any() and mask_b.any():
+        comp_cols = ["Quantidade", "Total", "Media"]
+        avg_qty_a, avg_vol_a, avg_ticket_a = df.loc[mask_a, comp_cols].mean()
+        avg_qty_b, avg_vol_b, avg_ticket_b = df.loc[mask_b, comp_cols].mean()
 
         delta_qty = (avg_qty_b - avg_qty_a) / avg_qty_a if avg_qty_a else None
         delta_vol = (avg_vol_b - avg_vol_a) / avg_vol_a if avg_vol_a else None
@@ -418,7 +440,7 @@ def render(lang: str):
         with c1:
             st.markdown(
                 render_comparison_item(
-                    t("comp_avg_qty", lang),
+                    tr["comp_avg_qty"],
                     fmt_number(avg_qty_a),
                     fmt_number(avg_qty_b),
                     delta_qty,
@@ -428,7 +450,7 @@ def render(lang: str):
         with c2:
             st.markdown(
                 render_comparison_item(
-                    t("comp_avg_vol", lang),
+                    tr["comp_avg_vol"],
                     fmt_brl(avg_vol_a),
                     fmt_brl(avg_vol_b),
                     delta_vol,
@@ -436,10 +458,10 @@ def render(lang: str):
                 unsafe_allow_html=True,
             )
         with c3:
-            ticket_fmt = lambda v: f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+            ticket_fmt = lambda v: f"R$ {v:,.2f}".translate(BR_TABLE)
             st.markdown(
                 render_comparison_item(
-                    t("comp_avg_ticket", lang),
+                    tr["comp_avg_ticket"],
                     ticket_fmt(avg_ticket_a),
                     ticket_fmt(avg_ticket_b),
                     delta_ticket,
@@ -447,15 +469,14 @@ def render(lang: str):
                 unsafe_allow_html=True,
             )
     else:
-        st.info(t("no_data_period", lang))
-
-    st.markdown("<br>", unsafe_allow_html=True)
+        st.info(tr["no_data_period"])
 
     # =====================================================================
     # DESCRIPTIVE STATISTICS
     # =====================================================================
+    # Espaçador + título num único elemento markdown
     st.markdown(
-        f'<div class="section-title">{t("stats_title", lang)}</div>',
+        f'<br><div class="section-title">{tr["stats_title"]}</div>',
         unsafe_allow_html=True,
     )
 
@@ -466,17 +487,15 @@ def render(lang: str):
         hide_index=True,
     )
 
-    st.markdown("<br>", unsafe_allow_html=True)
-
     # =====================================================================
     # DATA TABLE + DOWNLOADS
     # =====================================================================
     st.markdown(
-        f'<div class="section-title">{t("data_title", lang)}</div>',
+        f'<br><div class="section-title">{tr["data_title"]}</div>',
         unsafe_allow_html=True,
     )
 
-    st.caption(t("data_showing", lang, n=len(df)))
+    st.caption(tr.fmt("data_showing", n=len(df)))
 
     # Download buttons
     dl1, dl2, dl_spacer = st.columns([1, 1, 4])
@@ -484,16 +503,16 @@ def render(lang: str):
     # Prepare display DataFrame
     df_display = df.copy()
     df_display.columns = [
-        t("col_date", lang),
-        t("col_quantity", lang),
-        t("col_total", lang),
-        t("col_average", lang),
+        tr["col_date"],
+        tr["col_quantity"],
+        tr["col_total"],
+        tr["col_average"],
     ]
 
     with dl1:
         st.download_button(
-            label=t("download_csv", lang),
-            data=to_csv_bytes(df),
+            label=tr["download_csv"],
+            data=_csv_cached(df),
             file_name=f"spi_pix_{start_date}_{end_date}.csv",
             mime="text/csv",
             use_container_width=True,
@@ -501,8 +520,8 @@ def render(lang: str):
 
     with dl2:
         st.download_button(
-            label=t("download_xlsx", lang),
-            data=to_excel_bytes(df),
+            label=tr["download_xlsx"],
+            data=_xlsx_cached(df),
             file_name=f"spi_pix_{start_date}_{end_date}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             use_container_width=True,
@@ -520,12 +539,12 @@ def render(lang: str):
     st.markdown(
         f"""
         <div class="footer">
-            {t("source", lang)}:
+            {tr["source"]}:
             <a href="https://dadosabertos.bcb.gov.br/" target="_blank">
                 dadosabertos.bcb.gov.br
             </a>
             · Endpoint: PixLiquidadosAtual
-            · {t("built_with", lang)}
+            · {tr["built_with"]}
         </div>
         """,
         unsafe_allow_html=True,
@@ -14,10 +14,12 @@ Sub-módulos:
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
+from functools import lru_cache
 from utils.i18n import t
-from utils.helpers import to_excel_bytes, to_csv_bytes
+from utils.helpers import XLSX_MAX_ROWS, df_fingerprint, frames_to_excel_bytes, frames_to_csv_bytes
 
 
 # =============================================================================
@@ -46,6 +48,8 @@ DAILY_MODALITIES = [
     "Desconto de duplicatas - Prefixado",
 ]
 
+DAILY_MODALITIES_SET = frozenset(DAILY_MODALITIES)
+
 ALL_MODALITIES = DAILY_MODALITIES + MONTHLY_MODALITIES
 
 # Modalities excluded from ranking tab only
@@ -60,7 +64,15 @@ RANKING_EXCLUDED = {
 
 RANKING_MODALITIES = [m for m in ALL_MODALITIES if m not in RANKING_EXCLUDED]
 
+# Max concurrent API requests per load (ranking, bank and download tabs)
+FETCH_WORKERS = 8
+
+# Rows shown in the download tab preview table
+DOWNLOAD_PREVIEW_ROWS = 1000
+EXPORT_ROWS_PER_SEC = 50_000  # rough xlsxwriter throughput (the slower export), drives the build progress bar
+
 # Short labels for display
+@lru_cache(maxsize=64)
 def short_label(mod: str) -> str:
     """Create a shorter label for display."""
     return mod.replace("Pós-fixado referenciado em ", "Pós-").replace(" - Prefixado", " - Pré")
@@ -70,40 +82,96 @@ def short_label(mod: str) -> str:
 # Data fetching
 # =============================================================================
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_daily_modality(modality: str, limit: int = 200000) -> pd.DataFrame:
-    """Fetch data from TaxasJurosDiariaPorInicioPeriodo for a modality."""
+# Repeated string columns stored as categorical (integer codes)
+CATEGORICAL_COLUMNS = ("InstituicaoFinanceira", "Modalidade", "Segmento")
+
+# Rate columns, coerced to numeric but kept float64: they are exported to
+# XLSX as-is, and float32 values surface there as 12.34000015258789
+RATE_COLUMNS = ("TaxaJurosAoAno", "TaxaJurosAoMes")
+
+
+def _compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink the cached frame: repeated strings → category, rates → numeric
+    float64, the API's position column → smallest integer type.
+    """
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in RATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    if "Posicao" in df.columns:
+        df["Posicao"] = pd.to_numeric(df["Posicao"], errors="coerce", downcast="integer")
+    return df
+
+
+def _query_rates(endpoint: str, date_col: str, modality: str, limit: int) -> pd.DataFrame:
+    """Query a TaxaJuros endpoint for one modality (uncached), sorted by date."""
     from bcb import TaxaJuros
     em = TaxaJuros()
-    ep = em.get_endpoint("TaxasJurosDiariaPorInicioPeriodo")
+    ep = em.get_endpoint(endpoint)
     df = (
         ep.query()
         .filter(ep.Modalidade == modality)
-        .orderby(ep.InicioPeriodo.desc())
+        .orderby(getattr(ep, date_col).desc())
         .limit(limit)
         .collect()
     )
-    if not df.empty and "InicioPeriodo" in df.columns:
-        df["InicioPeriodo"] = pd.to_datetime(df["InicioPeriodo"], errors="coerce")
-    return df
+    if not df.empty and date_col in df.columns:
+        df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+        # API returns newest first; stable sort of a reversed run is O(n)
+        df = df.sort_values(date_col, kind="mergesort", ignore_index=True)
+    return _compact_dtypes(df)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_daily_modality(modality: str, limit: int = 200000) -> pd.DataFrame:
+    """Fetch data from TaxasJurosDiariaPorInicioPeriodo for a modality."""
+    return _query_rates("TaxasJurosDiariaPorInicioPeriodo", "InicioPeriodo", modality, limit)
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
 def fetch_monthly_modality(modality: str, limit: int = 200000) -> pd.DataFrame:
     """Fetch data from TaxasJurosMensalPorMes for a modality."""
-    from bcb import TaxaJuros
-    em = TaxaJuros()
-    ep = em.get_endpoint("TaxasJurosMensalPorMes")
-    df = (
-        ep.query()
-        .filter(ep.Modalidade == modality)
-        .orderby(ep.Mes.desc())
-        .limit(limit)
-        .collect()
-    )
-    if not df.empty and "Mes" in df.columns:
-        df["Mes"] = pd.to_datetime(df["Mes"], errors="coerce")
-    return df
+    return _query_rates("TaxasJurosMensalPorMes", "Mes", modality, limit)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_median_rates(modality: str, date_key: str, limit: int = 200000) -> tuple:
+    """
+    Median rate per date over the last 10 years (all history if none).
+    The raw frame is aggregated right after the query and never cached,
+    so only the small median series is kept. Returns (df_median, n_obs).
+    """
+    date_col = _DATE_COL[modality]
+    if _IS_DAILY[modality]:
+        df = _query_rates("TaxasJurosDiariaPorInicioPeriodo", date_col, modality, limit)
+    else:
+        df = _query_rates("TaxasJurosMensalPorMes", date_col, modality, limit)
+
+    if df.empty:
+        return df, 0
+
+    cutoff = pd.Timestamp.now() - pd.DateOffset(years=10)
+    df_plot = df[df[date_col] >= cutoff]
+    if df_plot.empty:
+        df_plot = df
+
+    # Frame is already date-sorted, so groupby can skip its own sort
+    df_median = df_plot.groupby(date_col, sort=False)["TaxaJurosAoAno"].median().reset_index()
+    return df_median, len(df)
+
+
+def slice_date_range(df: pd.DataFrame, date_col: str, start: np.datetime64, end: np.datetime64) -> pd.DataFrame:
+    """
+    Rows with start <= date_col <= end, via binary search.
+    Requires df sorted ascending by date_col (as returned by the fetchers).
+    """
+    dates = df[date_col].to_numpy()
+    lo = dates.searchsorted(start, side="left")
+    hi = dates.searchsorted(end, side="right")
+    return df.iloc[lo:hi]
 
 
 def get_latest_data(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
@@ -114,21 +182,29 @@ def get_latest_data(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
     return df[df[date_col] == max_date].copy()
 
 
+@lru_cache(maxsize=64)
 def is_daily(modality: str) -> bool:
     """Check if modality uses daily endpoint."""
-    return modality in DAILY_MODALITIES
+    return modality in DAILY_MODALITIES_SET
 
 
+@lru_cache(maxsize=64)
 def get_date_col(modality: str) -> str:
     """Get the date column name for a modality."""
     return "InicioPeriodo" if is_daily(modality) else "Mes"
 
 
+@lru_cache(maxsize=64)
 def get_bank_col(modality: str) -> str:
     """Get the institution name column."""
     return "InstituicaoFinanceira"
 
 
+# Per-modality metadata resolved once at import (used inside render loops)
+_IS_DAILY = {m: is_daily(m) for m in ALL_MODALITIES}
+_DATE_COL = {m: get_date_col(m) for m in ALL_MODALITIES}
+
+
 # =============================================================================
 # Plotly chart
 # =============================================================================
@@ -148,53 +224,41 @@ PLOTLY_LAYOUT_BASE = dict(
 GRID_STYLE = dict(gridcolor="rgba(148,163,184,0.07)", showline=False)
 
 
-def make_median_chart(df: pd.DataFrame, date_col: str, mod_name: str, lang: str) -> go.Figure:
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False, hash_funcs={pd.DataFrame: df_fingerprint})
+def make_median_chart(df_median: pd.DataFrame, date_col: str, mod_name: str, lang: str) -> dict:
     """
-    Scatter plot of median rate over time (grouped by date).
+    Scatter plot of median rate over time (one point per date).
     Like the reference chart: Mediana das Taxas de Juros.
+    Expects the output of fetch_median_rates.
     """
-    cutoff = pd.Timestamp.now() - pd.DateOffset(years=10)
-    df_plot = df[df[date_col] >= cutoff].copy()
-
-    if df_plot.empty:
-        df_plot = df.copy()
-
-    # Group by date, compute median
-    df_median = df_plot.groupby(date_col)["TaxaJurosAoAno"].median().reset_index()
-    df_median = df_median.sort_values(date_col)
-
-    fig = go.Figure()
-
-    fig.add_trace(
-        go.Scatter(
-            x=df_median[date_col],
-            y=df_median["TaxaJurosAoAno"],
-            mode="markers",
-            marker=dict(
-                color="#22D3EE",
-                size=3,
-                opacity=0.6,
-            ),
-            hovertemplate=(
-                "%{x|%d/%m/%Y}<br>"
-                "Mediana: %{y:,.2f}% a.a.<extra></extra>"
-            ),
-            showlegend=False,
-        )
-    )
-
-    fig.update_layout(
-        **PLOTLY_LAYOUT_BASE,
-        title=dict(
-            text=f"Mediana das Taxas de Juros: {mod_name} — Fonte: BCB",
-            font=dict(size=13),
-        ),
-        height=400,
-        xaxis={**GRID_STYLE, "title": t("tax_chart_xaxis", lang)},
-        yaxis={**GRID_STYLE, "title": t("tax_chart_yaxis", lang)},
-    )
-
-    return fig
+    # Figure as a plain dict: serialized straight to Plotly.js and cheap to
+    # keep in the cache (no go.Figure objects)
+    return {
+        "data": [
+            {
+                "type": "scatter",
+                "x": df_median[date_col].tolist(),
+                "y": df_median["TaxaJurosAoAno"].tolist(),
+                "mode": "markers",
+                "marker": {"color": "#22D3EE", "size": 3, "opacity": 0.6},
+                "hovertemplate": (
+                    "%{x|%d/%m/%Y}<br>"
+                    "Mediana: %{y:,.2f}% a.a.<extra></extra>"
+                ),
+                "showlegend": False,
+            }
+        ],
+        "layout": {
+            **PLOTLY_LAYOUT_BASE,
+            "title": {
+                "text": f"Mediana das Taxas de Juros: {mod_name} — Fonte: BCB",
+                "font": {"size": 13},
+            },
+            "height": 400,
+            "xaxis": {**GRID_STYLE, "title": t("tax_chart_xaxis", lang)},
+            "yaxis": {**GRID_STYLE, "title": t("tax_chart_yaxis", lang)},
+        },
+    }
 
 
 # =============================================================================
@@ -233,8 +297,32 @@ TABLE_CSS = """
 """
 
 
+RANKING_ROW_TEMPLATE = """
+        <tr>
+            <td style="color:#22D3EE; font-weight:700; font-family:Space Mono,monospace;">{rank}</td>
+            <td>{name}</td>
+            <td style="text-align:right; font-family:Space Mono,monospace;">{rate}</td>
+        </tr>"""
+
+
+BANK_ROW_TEMPLATE = """
+        <tr>
+            <td style="font-weight:500; color:#F1F5F9; font-size:12px;">{mod}</td>
+            <td style="text-align:right; font-family:Space Mono,monospace;">{rate}</td>
+            <td style="text-align:center; font-family:Space Mono,monospace; color:#22D3EE;">{pos}</td>
+        </tr>"""
+
+
 def render_ranking_table(df: pd.DataFrame, lang: str) -> str:
     """Render styled HTML ranking table."""
+    names = tuple(df["InstituicaoFinanceira"])
+    rates = tuple(df["TaxaJurosAoAno"].round(4))
+    return _build_ranking_table(names, rates, lang)
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _build_ranking_table(names: tuple, rates: tuple, lang: str) -> str:
+    """Build the ranking table HTML (cached by institution names, rates and language)."""
     header = f"""
     <tr>
         <th style="width:40px;">#</th>
@@ -242,18 +330,14 @@ def render_ranking_table(df: pd.DataFrame, lang: str) -> str:
         <th style="text-align:right;">{t("tax_rate", lang)}</th>
     </tr>"""
 
-    rows = ""
-    for i, (_, row) in enumerate(df.iterrows()):
-        rank = i + 1
-        name = row.get("InstituicaoFinanceira", "—")
-        rate = row.get("TaxaJurosAoAno", float("nan"))
-        rate_str = f"{rate:,.2f}" if pd.notna(rate) else "—"
-        rows += f"""
-        <tr>
-            <td style="color:#22D3EE; font-weight:700; font-family:Space Mono,monospace;">{rank}</td>
-            <td>{name}</td>
-            <td style="text-align:right; font-family:Space Mono,monospace;">{rate_str}</td>
-        </tr>"""
+    rows = "".join(
+        RANKING_ROW_TEMPLATE.format(
+            rank=i + 1,
+            name=name,
+            rate=f"{rate:,.2f}" if pd.notna(rate) else "—",
+        )
+        for i, (name, rate) in enumerate(zip(names, rates))
+    )
 
     return f"""
     <table class="tax-table">
@@ -327,6 +411,40 @@ def render(lang: str):
 # Shared data loader
 # =============================================================================
 
+# Bump when the layout of the persisted latest-data frames changes. Always pass it
+# explicitly: st.cache_data keys on the arguments given, not on defaults
+LATEST_CACHE_VERSION = 1
+
+
+@st.cache_data(persist="disk", max_entries=256, show_spinner=False)
+def _fetch_latest(modality: str, date_key: str, version: int) -> pd.DataFrame:
+    """
+    Latest-date snapshot of one modality (zero rates dropped, `_rank` added).
+    Persisted to disk and shared across sessions; `date_key` (today's ISO
+    date) rolls the entry over daily, since persisted caches ignore ttl.
+    """
+    if _IS_DAILY[modality]:
+        df = fetch_daily_modality(modality, limit=5000)
+    else:
+        df = fetch_monthly_modality(modality, limit=5000)
+
+    # Empty results are raised, not returned: a returned frame would be persisted
+    # under today's key and hide the modality until midnight. Callers skip errors.
+    if df.empty:
+        raise ValueError(f"No rate data returned for {modality!r}")
+
+    df_latest = get_latest_data(df, _DATE_COL[modality])
+    # Excluir IFs com taxa zero
+    df_latest = df_latest[df_latest["TaxaJurosAoAno"] > 0].reset_index(drop=True)
+    if df_latest.empty:
+        raise ValueError(f"No positive rates on the latest date for {modality!r}")
+    # Position among banks (lower rate = better), computed once per load
+    df_latest["_rank"] = (
+        df_latest["TaxaJurosAoAno"].rank(method="min", ascending=True).astype("Int64")
+    )
+    return df_latest
+
+
 def _load_all_latest(selected_mods: list, progress_holder=None) -> dict:
     """
     Fetch latest data for each selected modality.
@@ -334,27 +452,42 @@ def _load_all_latest(selected_mods: list, progress_holder=None) -> dict:
     """
     results = {}
     total = len(selected_mods)
+    date_key = date.today().isoformat()
 
-    for i, mod in enumerate(selected_mods):
-        try:
-            if is_daily(mod):
-                df = fetch_daily_modality(mod, limit=5000)
-                date_col = "InicioPeriodo"
-            else:
-                df = fetch_monthly_modality(mod, limit=5000)
-                date_col = "Mes"
+    # Modalities are fetched concurrently; progress is reported from this thread
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, total)) as executor:
+        futures = {
+            executor.submit(_fetch_latest, mod, date_key, LATEST_CACHE_VERSION): mod
+            for mod in selected_mods
+        }
 
-            if not df.empty:
-                df_latest = get_latest_data(df, date_col)
-                if not df_latest.empty:
-                    results[mod] = df_latest
-        except Exception:
-            pass
+        for i, future in enumerate(as_completed(futures)):
+            try:
+                results[futures[future]] = future.result()
+            except Exception:
+                pass
 
-        if progress_holder:
-            progress_holder.progress((i + 1) / total)
+            if progress_holder:
+                progress_holder.progress((i + 1) / total)
 
-    return results
+    # Keep the caller's modality order
+    return {mod: results[mod] for mod in selected_mods if mod in results}
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False, hash_funcs={pd.DataFrame: df_fingerprint})
+def _build_rank_index(df_latest: pd.DataFrame) -> dict:
+    """
+    Per-modality lookup for the bank tab: bank → (rate, rank) from the
+    precomputed `_rank` column (first row per bank) and the number of banks.
+    """
+    first_rows = df_latest.drop_duplicates("InstituicaoFinanceira")
+    return {
+        "bank_rows": dict(zip(
+            first_rows["InstituicaoFinanceira"],
+            zip(first_rows["TaxaJurosAoAno"], first_rows["_rank"]),
+        )),
+        "n": len(df_latest),
+    }
 
 
 # =============================================================================
@@ -412,8 +545,6 @@ def _render_ranking(lang: str):
             continue
 
         df_latest = data[mod]
-        # Excluir IFs com taxa zero
-        df_latest = df_latest[df_latest["TaxaJurosAoAno"] > 0]
         df_sorted_desc = df_latest.sort_values("TaxaJurosAoAno", ascending=False).head(10)
         df_sorted_asc = df_latest.sort_values("TaxaJurosAoAno", ascending=True).head(10)
 
@@ -461,28 +592,47 @@ def _render_ranking(lang: str):
 def _render_bank(lang: str):
     query_btn = st.button(t("tax_query", lang), key="query_tax_bank", type="primary")
 
-    if query_btn:
+    # _fetch_latest snapshots are persisted per day (date_key), so reloading a
+    # complete load made today would only re-read the same disk snapshots: skip
+    # it until the day rolls over. A partial load (some modalities failed) can
+    # always be retried.
+    loaded_at = st.session_state.get("tax_bank_data_ts")
+    is_fresh = (
+        loaded_at is not None
+        and date.fromtimestamp(loaded_at) == date.today()
+        and len(st.session_state.get("tax_bank_data", {})) >= len(ALL_MODALITIES)
+    )
+
+    if query_btn and is_fresh:
+        st.caption(t("tax_data_fresh", lang, time=time.strftime("%H:%M", time.localtime(loaded_at))))
+    elif query_btn:
         progress = st.progress(0, text=t("loading", lang))
         data = _load_all_latest(ALL_MODALITIES, progress)
         progress.empty()
         st.session_state.tax_bank_data = data
+        st.session_state.tax_bank_data_ts = time.time()
+        st.session_state.pop("tax_bank_list", None)
 
     if "tax_bank_data" not in st.session_state:
         if "tax_ranking_data" in st.session_state:
             st.session_state.tax_bank_data = st.session_state.tax_ranking_data
+            st.session_state.pop("tax_bank_list", None)
         else:
             st.info(f"👆 {t('tax_query', lang)}")
             return
 
     data = st.session_state.tax_bank_data
 
-    # Collect all bank names
-    all_banks = set()
-    for df in data.values():
-        if "InstituicaoFinanceira" in df.columns:
-            all_banks.update(df["InstituicaoFinanceira"].dropna().unique())
+    # Collect all bank names (rebuilt only when tax_bank_data changes)
+    if "tax_bank_list" not in st.session_state:
+        st.session_state.tax_bank_list = sorted({
+            bank
+            for df in data.values()
+            if "InstituicaoFinanceira" in df.columns
+            for bank in df["InstituicaoFinanceira"].dropna().unique()
+        })
 
-    bank_list = sorted(all_banks)
+    bank_list = st.session_state.tax_bank_list
 
     selected_bank = st.selectbox(
         t("tax_select_bank", lang),
@@ -507,38 +657,30 @@ def _render_bank(lang: str):
         <th style="text-align:center;">{t("tax_position", lang)}</th>
     </tr>"""
 
-    rows_html = ""
+    row_parts = []
     for mod in ALL_MODALITIES:
         if mod not in data:
             continue
 
-        df_mod = data[mod]
-        bank_row = df_mod[df_mod["InstituicaoFinanceira"] == selected_bank]
-
-        if bank_row.empty:
+        rank_index = _build_rank_index(data[mod])
+        if selected_bank not in rank_index["bank_rows"]:
             continue
 
-        rate = bank_row["TaxaJurosAoAno"].iloc[0]
+        rate, rank = rank_index["bank_rows"][selected_bank]
         rate_str = f"{rate:,.2f}" if pd.notna(rate) else "—"
 
         # Ranking position (ascending = lower rate is better position)
         if pd.notna(rate):
-            n = len(df_mod)
-            rank = int((df_mod["TaxaJurosAoAno"] < rate).sum() + 1)
-            pos_str = f"{rank}º {t('tax_of_banks', lang, n=n)}"
+            n = rank_index["n"]
+            pos_str = f"{int(rank)}º {t('tax_of_banks', lang, n=n)}"
         else:
             pos_str = "—"
 
-        rows_html += f"""
-        <tr>
-            <td style="font-weight:500; color:#F1F5F9; font-size:12px;">{mod}</td>
-            <td style="text-align:right; font-family:Space Mono,monospace;">{rate_str}</td>
-            <td style="text-align:center; font-family:Space Mono,monospace; color:#22D3EE;">{pos_str}</td>
-        </tr>"""
+        row_parts.append(BANK_ROW_TEMPLATE.format(mod=mod, rate=rate_str, pos=pos_str))
 
-    if rows_html:
+    if row_parts:
         st.markdown(
-            f'<table class="tax-table"><thead>{header}</thead><tbody>{rows_html}</tbody></table>',
+            f'<table class="tax-table"><thead>{header}</thead><tbody>{"".join(row_parts)}</tbody></table>',
             unsafe_allow_html=True,
         )
     else:
@@ -564,11 +706,8 @@ def _render_charts(lang: str):
     if query_btn:
         with st.spinner(t("loading", lang)):
             try:
-                if is_daily(selected_mod):
-                    df = fetch_daily_modality(selected_mod, limit=200000)
-                else:
-                    df = fetch_monthly_modality(selected_mod, limit=200000)
-                st.session_state.tax_chart_data = (selected_mod, df)
+                df_median, n_obs = fetch_median_rates(selected_mod, date.today().isoformat())
+                st.session_state.tax_chart_data = (selected_mod, df_median, n_obs)
             except Exception as e:
                 st.error(t("api_error", lang))
                 st.code(str(e))
@@ -577,17 +716,17 @@ def _render_charts(lang: str):
     if "tax_chart_data" not in st.session_state:
         return
 
-    mod_name, df = st.session_state.tax_chart_data
-    date_col = get_date_col(mod_name)
+    mod_name, df_median, n_obs = st.session_state.tax_chart_data
+    date_col = _DATE_COL[mod_name]
 
-    if df.empty:
+    if df_median.empty:
         st.warning(t("no_data", lang))
         return
 
-    fig = make_median_chart(df, date_col, mod_name, lang)
+    fig = make_median_chart(df_median, date_col, mod_name, lang)
     st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
 
-    st.caption(f"📊 {len(df):,} observações")
+    st.caption(f"📊 {n_obs:,} observações")
 
 
 # =============================================================================
@@ -637,55 +776,98 @@ def _render_download(lang: str):
         return
 
     progress = st.progress(0, text=t("tax_downloading", lang))
-    all_frames = []
+    frames_by_mod = {}
     total = len(selected_mods)
+    ts_start = np.datetime64(pd.Timestamp(dl_start))
+    ts_end = np.datetime64(pd.Timestamp(dl_end))
+
+    # HTTP-bound fetches run concurrently; st.* calls stay on the script thread
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, total)) as executor:
+        futures = {
+            executor.submit(
+                fetch_daily_modality if _IS_DAILY[mod] else fetch_monthly_modality,
+                mod,
+                limit=100000,
+            ): mod
+            for mod in selected_mods
+        }
+
+        for i, future in enumerate(as_completed(futures)):
+            mod = futures[future]
+            try:
+                df = future.result()
+                if not df.empty:
+                    # Filter date range
+                    df_filtered = slice_date_range(df, _DATE_COL[mod], ts_start, ts_end)
+                    if not df_filtered.empty:
+                        frames_by_mod[mod] = df_filtered
+            except Exception:
+                pass
 
-    for i, mod in enumerate(selected_mods):
-        try:
-            if is_daily(mod):
-                df = fetch_daily_modality(mod, limit=100000)
-                date_col = "InicioPeriodo"
-            else:
-                df = fetch_monthly_modality(mod, limit=100000)
-                date_col = "Mes"
-
-            if not df.empty:
-                # Filter date range
-                mask = (df[date_col] >= pd.Timestamp(dl_start)) & (df[date_col] <= pd.Timestamp(dl_end))
-                df_filtered = df[mask].copy()
-                if not df_filtered.empty:
-                    all_frames.append(df_filtered)
-        except Exception:
-            pass
-
-        progress.progress((i + 1) / total, text=f"{t('tax_downloading', lang)} {mod[:40]}...")
+            progress.progress((i + 1) / total, text=f"{t('tax_downloading', lang)} {mod[:40]}...")
 
     progress.empty()
 
+    # Keep the user's modality order in the output
+    all_frames = [frames_by_mod[mod] for mod in selected_mods if mod in frames_by_mod]
+
     if not all_frames:
         st.warning(t("no_data", lang))
         return
 
-    df_all = pd.concat(all_frames, ignore_index=True)
-
-    st.success(f"✅ {len(df_all):,} registros")
+    # Exports are written frame by frame; only a small preview is concatenated
+    total_rows = sum(len(f) for f in all_frames)
+
+    st.success(f"✅ {total_rows:,} registros")
+
+    # Both exports are built off the script thread; the bar starts before either
+    # is submitted and advances on an elapsed-time estimate (neither pandas'
+    # to_csv nor xlsxwriter exposes a progress callback) until both are done
+    build_bar = st.progress(0, text=t("tax_building_files", lang))
+    expected = max(total_rows / EXPORT_ROWS_PER_SEC, 0.5)
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        csv_future = executor.submit(frames_to_csv_bytes, all_frames)
+        xlsx_future = (
+            executor.submit(frames_to_excel_bytes, all_frames)
+            if total_rows <= XLSX_MAX_ROWS
+            else None
+        )
+        pending = [f for f in (csv_future, xlsx_future) if f is not None]
+        while not all(f.done() for f in pending):
+            time.sleep(0.1)
+            build_bar.progress(
+                min((time.monotonic() - started) / expected, 0.95),
+                text=t("tax_building_files", lang),
+            )
+        csv_bytes = csv_future.result()
+        xlsx_bytes = xlsx_future.result() if xlsx_future is not None else None
+    build_bar.empty()
 
     dl1, dl2, _ = st.columns([1, 1, 4])
     with dl1:
         st.download_button(
             t("download_csv", lang),
-            data=to_csv_bytes(df_all),
+            data=csv_bytes,
             file_name=f"taxas_{dl_start}_{dl_end}.csv",
             mime="text/csv",
             use_container_width=True,
         )
     with dl2:
-        st.download_button(
-            t("download_xlsx", lang),
-            data=to_excel_bytes(df_all),
-            file_name=f"taxas_{dl_start}_{dl_end}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            use_container_width=True,
-        )
+        if xlsx_bytes is None:
+            st.caption(t("xlsx_too_large", lang, n=f"{total_rows:,}"))
+        else:
+            st.download_button(
+                t("download_xlsx", lang),
+                data=xlsx_bytes,
+                file_name=f"taxas_{dl_start}_{dl_end}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True,
+            )
 
-    st.dataframe(df_all, use_container_width=True, hide_index=True, height=400)
+    df_preview = pd.concat(
+        [f.head(DOWNLOAD_PREVIEW_ROWS) for f in all_frames], ignore_index=True
+    ).head(DOWNLOAD_PREVIEW_ROWS)
+    if total_rows > DOWNLOAD_PREVIEW_ROWS:
+        st.caption(t("data_showing", lang, n=f"{DOWNLOAD_PREVIEW_ROWS:,}"))
+    st.dataframe(df_preview, use_container_width=True, hide_index=True, height=400)
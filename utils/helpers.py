@@ -2,8 +2,11 @@
 Funções auxiliares para formatação de valores e componentes reutilizáveis.
 """
 
+import codecs
+import math
 import streamlit as st
 import pandas as pd
+from functools import lru_cache
 from io import BytesIO
 
 
@@ -11,52 +14,67 @@ from io import BytesIO
 # Formatação de números
 # =============================================================================
 
+# Tabela de tradução de separadores: notação americana → brasileira
+BR_TABLE = str.maketrans({",": ".", ".": ","})
+
+# Escalas do fmt_number: (divisor, sufixo, casas decimais)
+_SCALES = ((1e3, "K", 1), (1e6, "M", 2), (1e9, "B", 2), (1e12, "T", 2))
+
+
+def _is_missing(value) -> bool:
+    """Equivalente escalar de pd.isna: None, pd.NA e NaN/NaT (x != x)."""
+    return value is None or value is pd.NA or value != value
+
+
 def fmt_number(value: float, decimals: int = 0) -> str:
     """
     Formata um número grande com sufixos (M, B, T) em notação brasileira.
     Exemplos: 1_234_567 → '1,23M'  |  1_234_567_890 → '1,23B'
     """
-    if pd.isna(value):
+    if _is_missing(value):
         return "—"
 
     abs_val = abs(value)
 
-    if abs_val >= 1e12:
-        formatted = f"{value / 1e12:,.2f}T"
-    elif abs_val >= 1e9:
-        formatted = f"{value / 1e9:,.2f}B"
-    elif abs_val >= 1e6:
-        formatted = f"{value / 1e6:,.2f}M"
-    elif abs_val >= 1e3:
-        formatted = f"{value / 1e3:,.1f}K"
-    else:
+    if abs_val < 1e3:
         formatted = f"{value:,.{decimals}f}"
-
-    # Converte para notação brasileira (. → temp, , → ., temp → ,)
-    formatted = formatted.replace(",", "X").replace(".", ",").replace("X", ".")
+    else:
+        # Escala pela ordem de grandeza: 1e3 → K, 1e6 → M, 1e9 → B, 1e12+ → T
+        idx = len(_SCALES) - 1
+        if math.isfinite(abs_val):
+            idx = min(idx, int(math.log10(abs_val)) // 3 - 1)
+            if abs_val < _SCALES[idx][0]:  # log10 arredondado para cima
+                idx -= 1
+        divisor, suffix, dec = _SCALES[idx]
+        formatted = f"{value / divisor:,.{dec}f}{suffix}"
+
+    # Converte para notação brasileira (troca , ↔ . numa única passada)
+    formatted = formatted.translate(BR_TABLE)
 
     return formatted
 
 
 def fmt_brl(value: float) -> str:
     """Formata valor monetário brasileiro. Ex: 37621450000 → 'R$ 37,62B'"""
-    if pd.isna(value):
+    if _is_missing(value):
         return "—"
     return f"R$ {fmt_number(value)}"
 
 
 def fmt_pct(value: float) -> str:
     """Formata percentual. Ex: 0.1234 → '+12,34%'"""
-    if pd.isna(value):
+    if _is_missing(value):
         return "—"
     sign = "+" if value > 0 else ""
-    return f"{sign}{value * 100:,.2f}%".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"{sign}{value * 100:,.2f}%".translate(BR_TABLE)
 
 
 # =============================================================================
 # Componentes HTML reutilizáveis
 # =============================================================================
+# Funções puras de argumentos hashable: o HTML fica em cache entre reruns.
 
+@lru_cache(maxsize=256)
 def render_kpi_card(label: str, value: str, sub: str, color: str) -> str:
     """Gera o HTML de um card KPI."""
     return f"""
@@ -68,6 +86,7 @@ def render_kpi_card(label: str, value: str, sub: str, color: str) -> str:
     """
 
 
+@lru_cache(maxsize=256)
 def render_module_card(
     icon: str,
     title: str,
@@ -90,11 +109,12 @@ def render_module_card(
     """
 
 
+@lru_cache(maxsize=256)
 def render_comparison_item(
     label: str, val_a: str, val_b: str, delta: float
 ) -> str:
     """Gera HTML de um item de comparação."""
-    if pd.isna(delta):
+    if _is_missing(delta):
         delta_html = '<span style="color:#64748B;">—</span>'
     else:
         delta_class = "comp-delta-pos" if delta >= 0 else "comp-delta-neg"
@@ -113,18 +133,99 @@ def render_comparison_item(
     """
 
 
+# =============================================================================
+# Cache
+# =============================================================================
+
+def df_fingerprint(df: pd.DataFrame) -> tuple:
+    """
+    Assinatura leve de um DataFrame para `hash_funcs` do `st.cache_data`.
+    Usa formato, colunas e primeira/última linhas em vez do hash completo.
+    """
+    if df.empty:
+        return (df.shape, tuple(df.columns))
+    return (df.shape, tuple(df.columns), tuple(df.iloc[0]), tuple(df.iloc[-1]))
+
+
 # =============================================================================
 # Exportação de dados
 # =============================================================================
 
-def to_excel_bytes(df: pd.DataFrame) -> bytes:
+# Limite de linhas de uma planilha XLSX, descontando a linha de cabeçalho
+XLSX_MAX_ROWS = 1_048_576 - 1
+
+
+def _align_columns(frames: list) -> list:
+    """Reindexa os frames para a união de colunas (mesma ordem do pd.concat)."""
+    columns = list(dict.fromkeys(col for df in frames for col in df.columns))
+    return [df if list(df.columns) == columns else df.reindex(columns=columns) for df in frames]
+
+
+def frames_to_excel_bytes(frames: list, num_format_cols: tuple = ()) -> bytes:
+    """
+    Converte uma lista de DataFrames para bytes XLSX numa única planilha,
+    gravando um frame após o outro (sem concatená-los antes).
+    num_format_cols: colunas exibidas com '#,##0.00' (as demais ficam sem formato).
+    Obs.: não usar `constant_memory` — o pandas grava as células coluna a
+    coluna e esse modo só aceita escrita em ordem de linha.
+    """
+    total_rows = sum(len(df) for df in frames)
+    if total_rows > XLSX_MAX_ROWS:
+        raise ValueError(f"DataFrame com {total_rows} linhas excede o limite XLSX ({XLSX_MAX_ROWS}).")
+
+    frames = _align_columns(frames)
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        startrow = 0
+        for i, df in enumerate(frames):
+            df.to_excel(
+                writer,
+                index=False,
+                header=(i == 0),
+                startrow=startrow,
+                sheet_name="Dados SPI",
+            )
+            startrow += len(df) + (i == 0)
+
+        # Formato numérico apenas nas colunas pedidas pelo chamador
+        if num_format_cols:
+            sheet = writer.sheets["Dados SPI"]
+            num_fmt = writer.book.add_format({"num_format": "#,##0.00"})
+            for i, col in enumerate(frames[0].columns):
+                if col in num_format_cols:
+                    sheet.set_column(i, i, None, num_fmt)
+    return buffer.getvalue()
+
+
+def to_excel_bytes(df: pd.DataFrame, num_format_cols: tuple = ()) -> bytes:
     """Converte DataFrame para bytes XLSX."""
+    return frames_to_excel_bytes([df], num_format_cols)
+
+
+CSV_CHUNK_ROWS = 50_000
+
+
+def frames_to_csv_bytes(frames: list) -> bytes:
+    """
+    Converte uma lista de DataFrames para bytes CSV (encoding UTF-8 BOM para
+    Excel), um frame após o outro e sem concatená-los antes. Escreve em blocos
+    de linhas direto no buffer binário, sem montar o CSV inteiro como `str`.
+    """
     buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="Dados SPI")
+    buffer.write(codecs.BOM_UTF8)
+    for i, df in enumerate(_align_columns(frames)):
+        df.to_csv(
+            buffer,
+            index=False,
+            header=(i == 0),
+            sep=";",
+            decimal=",",
+            encoding="utf-8",
+            chunksize=CSV_CHUNK_ROWS,
+        )
     return buffer.getvalue()
 
 
 def to_csv_bytes(df: pd.DataFrame) -> bytes:
     """Converte DataFrame para bytes CSV (encoding UTF-8 BOM para Excel)."""
-    return df.to_csv(index=False, sep=";", decimal=",").encode("utf-8-sig")
+    return frames_to_csv_bytes([df])
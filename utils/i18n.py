@@ -3,7 +3,12 @@ Módulo de internacionalização (i18n) para o Laboratório de Dados Públicos.
 Suporta Português (pt) e Inglês (en).
 """
 
-TRANSLATIONS = {
+from collections import ChainMap
+from functools import lru_cache
+
+__all__ = ("t", "get_translator", "Translator")
+
+_TRANSLATIONS = {
     "pt": {
         # ===== Hub =====
         "app_title": "Laboratório de Dados Públicos",
@@ -112,6 +117,7 @@ TRANSLATIONS = {
         "data_showing": "Exibindo {n} registros",
         "download_csv": "📥 Baixar CSV",
         "download_xlsx": "📥 Baixar XLSX",
+        "xlsx_too_large": "XLSX indisponível: {n} registros excedem o limite do Excel. Use o CSV.",
         "col_date": "Data",
         "col_quantity": "Quantidade",
         "col_total": "Total (R$)",
@@ -249,6 +255,7 @@ TRANSLATIONS = {
         "tax_tab_download": "📥 Download",
         "tax_select_modalities": "Selecione as modalidades:",
         "tax_query": "🔍 Consultar Taxas",
+        "tax_data_fresh": "Dados carregados às {time} — ainda atualizados, nova consulta não necessária.",
         "tax_largest": "Maiores Taxas",
         "tax_smallest": "Menores Taxas",
         "tax_institution": "Instituição",
@@ -265,6 +272,7 @@ TRANSLATIONS = {
         "tax_download_desc": "Baixe dados de taxas de juros para todas as IFs em um intervalo de datas.",
         "tax_download_btn": "📥 Baixar Dados",
         "tax_downloading": "Baixando dados de taxas...",
+        "tax_building_files": "Gerando arquivos para download...",
         "tax_ref_date": "Data de referência",
         "tax_total_banks": "Total de bancos",
         "tax_cat_daily": "📅 Modalidades Diárias",
@@ -404,6 +412,7 @@ TRANSLATIONS = {
         "data_showing": "Showing {n} records",
         "download_csv": "📥 Download CSV",
         "download_xlsx": "📥 Download XLSX",
+        "xlsx_too_large": "XLSX unavailable: {n} records exceed Excel's row limit. Use the CSV.",
         "col_date": "Date",
         "col_quantity": "Quantity",
         "col_total": "Total (R$)",
@@ -541,6 +550,7 @@ TRANSLATIONS = {
         "tax_tab_download": "📥 Download",
         "tax_select_modalities": "Select modalities:",
         "tax_query": "🔍 Query Rates",
+        "tax_data_fresh": "Data loaded at {time} — still up to date, no reload needed.",
         "tax_largest": "Highest Rates",
         "tax_smallest": "Lowest Rates",
         "tax_institution": "Institution",
@@ -557,6 +567,7 @@ TRANSLATIONS = {
         "tax_download_desc": "Download interest rate data for all FIs within a date range.",
         "tax_download_btn": "📥 Download Data",
         "tax_downloading": "Downloading rate data...",
+        "tax_building_files": "Building download files...",
         "tax_ref_date": "Reference date",
         "tax_total_banks": "Total banks",
         "tax_cat_daily": "📅 Daily Modalities",
@@ -590,9 +601,58 @@ TRANSLATIONS = {
 }
 
 
+# Cada idioma resolvido com fallback para o português (chaves ainda não traduzidas),
+# achatado em dict comum na importação. _TRANSLATIONS não deve ser alterado depois disso.
+_RESOLVED: dict[str, dict[str, str]] = {
+    lang: dict(ChainMap(entries, _TRANSLATIONS["pt"]))
+    for lang, entries in _TRANSLATIONS.items()
+}
+
+# Tabela plana (idioma, chave) → texto
+_FLAT: dict[tuple[str, str], str] = {
+    (lang, key): text
+    for lang, entries in _RESOLVED.items()
+    for key, text in entries.items()
+}
+
+
+class Translator:
+    """
+    Tradutor ligado a um idioma: T["chave"] para rótulos fixos e
+    T.fmt("chave", n=...) (ou T("chave", ...)) para textos com parâmetros.
+    """
+
+    __slots__ = ("_entries",)
+
+    def __init__(self, lang: str = "pt"):
+        self._entries = _RESOLVED.get(lang, _RESOLVED["pt"])
+
+    def __getitem__(self, key: str) -> str:
+        return self._entries.get(key, key)
+
+    def fmt(self, key: str, **kwargs) -> str:
+        text = self[key]
+        if kwargs and "{" in text:
+            text = text.format(**kwargs)
+        return text
+
+    __call__ = fmt
+
+
+@lru_cache(maxsize=None)
+def get_translator(lang: str = "pt") -> Translator:
+    """
+    Retorna o Translator do idioma (uma instância por idioma).
+    Use uma vez por renderização: T = get_translator(lang); T["spi_title"].
+    """
+    return Translator(lang)
+
+
 def t(key: str, lang: str = "pt", **kwargs) -> str:
     """Retorna a tradução para a chave informada."""
-    text = TRANSLATIONS.get(lang, TRANSLATIONS["pt"]).get(key, key)
-    if kwargs:
+    text = _FLAT.get((lang, key))
+    if text is None:
+        text = _FLAT.get(("pt", key), key)
+    if kwargs and "{" in text:
         text = text.format(**kwargs)
     return text
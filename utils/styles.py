@@ -2,21 +2,21 @@
 Estilos CSS customizados para o Laboratório de Dados Públicos.
 """
 
+import re
+from functools import lru_cache
 
-def get_custom_css() -> str:
-    """Retorna o CSS customizado para injetar via st.markdown."""
-    return """
-    <style>
+
+# Fonte legível da folha de estilo, em fragmentos por componente; o que vai para
+# o navegador é a versão minificada. "base" vale para todas as páginas e vem primeiro.
+_FRAGMENTS_SRC = {
+    # Fontes, variáveis, barra superior, títulos de seção, rodapé e overrides
+    "base": """
     /* ===== Imports ===== */
     @import url('https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;600;700&family=Space+Mono:wght@400;700&display=swap');
 
     /* ===== Variables ===== */
     :root {
-        --accent-cyan: #22D3EE;
-        --accent-emerald: #34D399;
-        --accent-amber: #FBBF24;
-        --accent-rose: #FB7185;
-        --accent-violet: #A78BFA;
+        /* --accent-*: geradas de _ACCENTS */
         --bg-card: #1A2332;
         --bg-card-hover: #1F2B3E;
         --border-subtle: rgba(148, 163, 184, 0.1);
@@ -24,8 +24,10 @@ def get_custom_css() -> str:
     }
 
     /* ===== Global ===== */
-    .stApp {
-        font-family: 'DM Sans', sans-serif !important;
+    /* "html body" eleva a especificidade acima das classes geradas pelo Streamlit
+       (uma classe só) sem !important; revisar se o Streamlit mudar esses seletores */
+    html body .stApp {
+        font-family: 'DM Sans', sans-serif;
     }
 
     /* Hide default Streamlit elements */
@@ -74,6 +76,51 @@ def get_custom_css() -> str:
         font-family: 'Space Mono', monospace;
     }
 
+    /* ===== Section titles ===== */
+    .section-title {
+        font-size: 15px;
+        font-weight: 600;
+        color: #F1F5F9;
+        margin-bottom: 16px;
+        display: flex;
+        align-items: center;
+        gap: 8px;
+    }
+
+    /* ===== Footer ===== */
+    .footer {
+        text-align: center;
+        padding: 30px 0;
+        font-size: 12px;
+        color: var(--text-muted);
+        font-family: 'Space Mono', monospace;
+        border-top: 1px solid var(--border-subtle);
+        margin-top: 40px;
+    }
+
+    .footer a {
+        color: var(--accent-cyan);
+        text-decoration: none;
+    }
+
+    /* ===== Streamlit overrides ===== */
+    html body .stButton > button {
+        font-family: 'DM Sans', sans-serif;
+    }
+
+    div[data-testid="stExpander"] {
+        background: var(--bg-card);
+        border: 1px solid var(--border-subtle);
+        border-radius: 14px;
+    }
+
+    .stDataFrame {
+        border-radius: 10px;
+        overflow: hidden;
+    }
+    """,
+    # Página principal: badge, título e cards de módulos
+    "hub": """
     /* ===== Badge ===== */
     .api-badge {
         display: inline-flex;
@@ -96,6 +143,7 @@ def get_custom_css() -> str:
         border-radius: 50%;
         background: var(--accent-emerald);
         animation: pulse-dot 2s ease-in-out infinite;
+        will-change: opacity;  /* camada própria: a animação fica no compositor */
     }
 
     @keyframes pulse-dot {
@@ -103,6 +151,10 @@ def get_custom_css() -> str:
         50% { opacity: 0.3; }
     }
 
+    @media (prefers-reduced-motion: reduce) {
+        .api-badge::before { animation: none; }
+    }
+
     /* ===== Hub Title ===== */
     .hub-title {
         font-size: 44px;
@@ -131,10 +183,15 @@ def get_custom_css() -> str:
         border-radius: 16px;
         padding: 28px 24px;
         cursor: pointer;
-        transition: all 0.35s cubic-bezier(0.4, 0, 0.2, 1);
+        transition-property: transform, background, border-color, box-shadow;
+        transition-duration: 0.35s;
+        transition-timing-function: cubic-bezier(0.4, 0, 0.2, 1);
         position: relative;
         overflow: hidden;
         height: 100%;
+        /* fora da tela o navegador pula layout/pintura; "auto" lembra a última altura real */
+        content-visibility: auto;
+        contain-intrinsic-size: auto 220px;
     }
 
     .module-card:hover {
@@ -142,11 +199,7 @@ def get_custom_css() -> str:
         transform: translateY(-4px);
     }
 
-    .module-card-cyan:hover    { border-color: var(--accent-cyan);    box-shadow: 0 0 20px rgba(34,211,238,0.15); }
-    .module-card-emerald:hover { border-color: var(--accent-emerald); box-shadow: 0 0 20px rgba(52,211,153,0.15); }
-    .module-card-amber:hover   { border-color: var(--accent-amber);   box-shadow: 0 0 20px rgba(251,191,36,0.15); }
-    .module-card-rose:hover    { border-color: var(--accent-rose);    box-shadow: 0 0 20px rgba(251,113,133,0.15); }
-    .module-card-violet:hover  { border-color: var(--accent-violet);  box-shadow: 0 0 20px rgba(167,139,250,0.15); }
+    /* Hover por cor: gerado de _ACCENTS */
 
     .module-card .icon {
         font-size: 28px;
@@ -186,7 +239,9 @@ def get_custom_css() -> str:
         opacity: 0.4;
         pointer-events: none;
     }
-
+    """,
+    # Cards de KPI (render_kpi_card)
+    "kpi": """
     /* ===== KPI Cards ===== */
     .kpi-card {
         background: var(--bg-card);
@@ -195,6 +250,8 @@ def get_custom_css() -> str:
         padding: 20px;
         position: relative;
         overflow: hidden;
+        content-visibility: auto;
+        contain-intrinsic-size: auto 110px;
     }
 
     .kpi-card::before {
@@ -204,10 +261,7 @@ def get_custom_css() -> str:
         height: 2px;
     }
 
-    .kpi-cyan::before    { background: var(--accent-cyan); }
-    .kpi-emerald::before { background: var(--accent-emerald); }
-    .kpi-amber::before   { background: var(--accent-amber); }
-    .kpi-rose::before    { background: var(--accent-rose); }
+    /* Faixa superior por cor: gerada de _ACCENTS */
 
     .kpi-label {
         font-size: 12px;
@@ -224,28 +278,16 @@ def get_custom_css() -> str:
         letter-spacing: -0.02em;
     }
 
-    .kpi-value-cyan    { color: var(--accent-cyan); }
-    .kpi-value-emerald { color: var(--accent-emerald); }
-    .kpi-value-amber   { color: var(--accent-amber); }
-    .kpi-value-rose    { color: var(--accent-rose); }
+    /* Valor por cor: gerado de _ACCENTS */
 
     .kpi-sub {
         font-size: 11px;
         color: var(--text-muted);
         margin-top: 2px;
     }
-
-    /* ===== Section titles ===== */
-    .section-title {
-        font-size: 15px;
-        font-weight: 600;
-        color: #F1F5F9;
-        margin-bottom: 16px;
-        display: flex;
-        align-items: center;
-        gap: 8px;
-    }
-
+    """,
+    # Comparação A/B (render_comparison_item)
+    "comparison": """
     /* ===== Comparison ===== */
     .comp-item {
         text-align: center;
@@ -268,37 +310,66 @@ def get_custom_css() -> str:
 
     .comp-delta-pos { color: var(--accent-emerald); font-size: 12px; font-family: 'Space Mono', monospace; }
     .comp-delta-neg { color: var(--accent-rose); font-size: 12px; font-family: 'Space Mono', monospace; }
-
-    /* ===== Footer ===== */
-    .footer {
-        text-align: center;
-        padding: 30px 0;
-        font-size: 12px;
-        color: var(--text-muted);
-        font-family: 'Space Mono', monospace;
-        border-top: 1px solid var(--border-subtle);
-        margin-top: 40px;
-    }
-
-    .footer a {
-        color: var(--accent-cyan);
-        text-decoration: none;
-    }
-
-    /* ===== Streamlit overrides ===== */
-    .stButton > button {
-        font-family: 'DM Sans', sans-serif !important;
-    }
-
-    div[data-testid="stExpander"] {
-        background: var(--bg-card);
-        border: 1px solid var(--border-subtle);
-        border-radius: 14px;
-    }
-
-    .stDataFrame {
-        border-radius: 10px;
-        overflow: hidden;
-    }
-    </style>
+    """,
+}
+
+
+# Paleta de destaque: as regras por cor (variáveis, hover dos cards, KPIs) saem daqui
+_ACCENTS = {
+    "cyan": "#22D3EE",
+    "emerald": "#34D399",
+    "amber": "#FBBF24",
+    "rose": "#FB7185",
+    "violet": "#A78BFA",
+}
+
+
+def _rgba(hex_color: str, alpha: float) -> str:
+    r, g, b = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgba({r},{g},{b},{alpha})"
+
+
+# Regras por cor, já minificadas, anexadas ao fragmento correspondente
+_ACCENT_RULES = {
+    "base": ":root{"
+    + ";".join(f"--accent-{name}:{color}" for name, color in _ACCENTS.items())
+    + "}",
+    "hub": "".join(
+        f".module-card-{name}:hover{{border-color:var(--accent-{name});"
+        f"box-shadow:0 0 20px {_rgba(color, 0.15)}}}"
+        for name, color in _ACCENTS.items()
+    ),
+    "kpi": "".join(
+        f".kpi-{name}::before{{background:var(--accent-{name})}}"
+        f".kpi-value-{name}{{color:var(--accent-{name})}}"
+        for name in _ACCENTS
+    ),
+}
+
+
+def _minify_css(css: str) -> str:
+    """Remove comentários, espaços redundantes e o último ';' de cada bloco."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+# Fragmentos minificados uma vez na importação do módulo
+_FRAGMENTS = {
+    name: _minify_css(src) + _ACCENT_RULES.get(name, "")
+    for name, src in _FRAGMENTS_SRC.items()
+}
+
+
+@lru_cache(maxsize=32)
+def get_custom_css(parts: tuple | None = None) -> str:
+    """
+    Retorna o CSS customizado para injetar via st.markdown.
+    parts seleciona os fragmentos (sempre junto com "base"); None inclui todos.
     """
+    selected = _FRAGMENTS if parts is None else {"base", *parts}
+    css_parts = ["<style>"]
+    css_parts.extend(css for name, css in _FRAGMENTS.items() if name in selected)
+    css_parts.append("</style>")
+    return "".join(css_parts)